@@ -1,21 +1,23 @@
 from flask import Flask, request, jsonify
 import pandas as pd
 from flask_cors import CORS # CORS for handling Cross-Origin Resource Sharing
-import pickle
+from asgiref.wsgi import WsgiToAsgi
 import regex as re 
 import string
+from functools import lru_cache
 from preprocess import preprocess_text
+from model_io import load_model
 
 app = Flask(__name__)
 
 # Enable CORS for all routes, allowing requests from any origin
 CORS(app,resources={r"/*":{"origins":"*"}})
 
-with open(r'model_control.pkl', 'rb') as f:
-    model_control, weights_control = pickle.load(f)
-
-with open(r'model_alz.pkl', 'rb') as f:
-    model_alz, weights_alz = pickle.load(f)
+# Memory-maps the .joblib dumps when present (run `python model_io.py` once).
+# The feature weights are folded into coef_ so predict needs no multiply, and
+# coef_ is kept in float32 to match the vectorizer output (see preprocess.py).
+model_control = load_model('model_control')
+model_alz = load_model('model_alz')
 
 
 @app.route('/', methods=['GET'])
@@ -27,21 +29,53 @@ def get_data():
 
 raw_test = "the boy is on a stool that is falling while he's trying to get some cookies out_of the cookie jar in the top shelf (.) of the cupboard .  the little girl is reaching for a cookie .  it looks like she's sort of laughing at the boy or putting her finger up to her mouth to be quiet so her mother doesn't hear who is in the kitchen drying dishes but the water in the sink is overflowing onto the floor and she's stepping in the water .  the window is open .  looks like &+s it's summer outside . [+ gram]  yeah there's trees with leaves .  is that all (.) you want me to do ? [+ exc]  she's [//] (.) doesn't look it's like she hears them .  she doesn't seem to be aware of them .  some of the dishes are already washed and dried .  is that all you want me to say ? [+ exc]"
 
+# Preprocess the sample once for the liveness probe, then drop the raw text
+RAW_TEST_FEATURES = preprocess_text(raw_test)
+del raw_test
+
+
+# Repeat submissions of the same transcript skip preprocessing and inference
+@lru_cache(maxsize=4096)
+def _score(text):
+    features = preprocess_text(text)
+    prob_control = model_control.predict_proba(features)
+    prob_alz = model_alz.predict_proba(features)
+    return float(prob_control[0][1]), float(prob_alz[0][1])
+
 
 # Define a route for making predictions
 @app.route('/predict', methods=['POST'])
 def predict():
     try:
         text = request.get_json()
-        features = preprocess_text(text['data'])
-        prob_control = model_control.predict_proba(features.multiply(weights_control))
-        prob_alz = model_alz.predict_proba(features.multiply(weights_alz))
-        print(prob_control, prob_alz)
-        prediction = 1 if prob_control[0][1] > prob_alz[0][1] else 0
+        control_score, alz_score = _score(text['data'])
+        prediction = 1 if control_score > alz_score else 0
         return jsonify({'Prediction': prediction,
-                        'Confidence': prob_control[0][1]})
+                        'Confidence': control_score})
     except Exception as e:
         return jsonify({'error': str(e)})
 
+
+@app.route('/healthz', methods=['GET'])
+def healthz():
+    # Exercises both models without any preprocessing
+    prob_control = model_control.predict_proba(RAW_TEST_FEATURES)
+    prob_alz = model_alz.predict_proba(RAW_TEST_FEATURES)
+    return jsonify({'status': 'ok',
+                    'control': float(prob_control[0][1]),
+                    'alz': float(prob_alz[0][1])})
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    return jsonify({'score_cache': _score.cache_info()._asdict()})
+
+# ASGI entry point for production. WSGI calls run on one thread per process, so
+# scale with workers; --preload loads spaCy and the models once in the master and
+# the forked workers share them (uvicorn picks uvloop/httptools when installed):
+#   gunicorn --preload -w $(nproc) -k uvicorn.workers.UvicornWorker -b 0.0.0.0:3000 app:asgi_app
+asgi_app = WsgiToAsgi(app)
+
 if __name__ == '__main__':
+    # Single-process development server
     app.run(debug=True, port=3000)
\ No newline at end of file
@@ -1,11 +1,14 @@
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Dict, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 import os
+import time
+import hashlib
 from dotenv import load_dotenv
 
 from database import get_db
@@ -24,6 +27,13 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 # OAuth2 scheme
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token")
 
+# Resolved users per bearer token, so repeat requests skip the JWT decode and
+# the users query. Entries live for at most USER_CACHE_TTL_SECONDS and never
+# past the token's own expiry.
+USER_CACHE_TTL_SECONDS = 60
+USER_CACHE_MAX_SIZE = 10_000
+_user_cache: Dict[bytes, Tuple[float, User]] = {}
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against its hash"""
     return pwd_context.verify(plain_password, hashed_password)
@@ -32,13 +42,14 @@ def get_password_hash(password: str) -> str:
     """Generate hash for a password"""
     return pwd_context.hash(password)
 
-def get_user_by_username(db: Session, username: str) -> Optional[User]:
+async def get_user_by_username(db: AsyncSession, username: str) -> Optional[User]:
     """Get user by username"""
-    return db.query(User).filter(User.username == username).first()
+    result = await db.execute(select(User).where(User.username == username))
+    return result.scalars().first()
 
-def authenticate_user(db: Session, username: str, password: str) -> Optional[User]:
+async def authenticate_user(db: AsyncSession, username: str, password: str) -> Optional[User]:
     """Authenticate user with username and password"""
-    user = get_user_by_username(db, username)
+    user = await get_user_by_username(db, username)
     if not user:
         return None
     if not verify_password(password, user.hashed_password):
@@ -58,6 +69,10 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def _token_cache_key(token: str) -> bytes:
+    """Hash the token so raw credentials are not kept in the cache"""
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
 def verify_token(token: str) -> Optional[dict]:
     """Verify JWT token and return payload"""
     try:
@@ -65,13 +80,13 @@ def verify_token(token: str) -> Optional[dict]:
         username: str = payload.get("sub")
         if username is None:
             return None
-        return {"username": username}
+        return {"username": username, "exp": payload.get("exp")}
     except JWTError:
         return None
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> User:
     """Get current authenticated user"""
     credentials_exception = HTTPException(
@@ -80,14 +95,32 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     
+    cache_key = _token_cache_key(token)
+    cached = _user_cache.get(cache_key)
+    if cached is not None:
+        expires_at, user = cached
+        if expires_at > time.time():
+            return user
+        del _user_cache[cache_key]
+    
     token_data = verify_token(token)
     if token_data is None:
         raise credentials_exception
     
-    user = get_user_by_username(db, username=token_data["username"])
+    user = await get_user_by_username(db, username=token_data["username"])
     if user is None:
         raise credentials_exception
     
+    # Detach so commits in this request's session don't expire the cached copy
+    db.expunge(user)
+    
+    expires_at = time.time() + USER_CACHE_TTL_SECONDS
+    if token_data["exp"] is not None:
+        expires_at = min(expires_at, token_data["exp"])
+    if len(_user_cache) >= USER_CACHE_MAX_SIZE:
+        _user_cache.pop(next(iter(_user_cache)))
+    _user_cache[cache_key] = (expires_at, user)
+    
     return user
 
 async def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
@@ -0,0 +1,76 @@
+import hashlib
+import logging
+import os
+from typing import Any, Awaitable, Callable, Optional
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# Optional: responses are only cached when REDIS_URL is set and redis is installed
+REDIS_URL = os.getenv("REDIS_URL")
+PROGRESS_CACHE_TTL_SECONDS = int(os.getenv("PROGRESS_CACHE_TTL_SECONDS", "300"))
+NLP_CACHE_TTL_SECONDS = int(os.getenv("NLP_CACHE_TTL_SECONDS", "86400"))
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+_client: Optional["aioredis.Redis"] = None
+if REDIS_URL and aioredis is not None:
+    _client = aioredis.from_url(REDIS_URL)
+elif REDIS_URL:
+    logger.warning("REDIS_URL is set but the redis package is not installed; caching disabled")
+
+def cache_enabled() -> bool:
+    """Whether a Redis cache is configured"""
+    return _client is not None
+
+def progress_key(doctor_id: int, patient_id: str) -> str:
+    """Cache key for a patient's progress timelines (a hash with one field per page)"""
+    return f"progress:{doctor_id}:{patient_id}"
+
+def nlp_key(text: str) -> str:
+    """Cache key for the NLP analysis of a text"""
+    # The exact text is hashed: case and spacing change spaCy's tags
+    return "nlp:" + hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+async def cached_json(key: str, ttl: int, loader: Callable[[], Awaitable[Any]],
+                      field: str = "") -> Any:
+    """Return the cached JSON value for key/field, or load, cache and return it"""
+    if _client is None:
+        return await loader()
+
+    try:
+        cached = await _client.hget(key, field)
+        if cached is not None:
+            return orjson.loads(cached)
+    except Exception as e:
+        # A cache outage should slow requests down, not fail them
+        logger.warning("Cache read failed for %s: %s", key, e)
+        return await loader()
+
+    value = await loader()
+    try:
+        async with _client.pipeline(transaction=False) as pipe:
+            pipe.hset(key, field, orjson.dumps(value))
+            pipe.expire(key, ttl)
+            await pipe.execute()
+    except Exception as e:
+        logger.warning("Cache write failed for %s: %s", key, e)
+    return value
+
+async def invalidate(key: str):
+    """Drop a cached key (all of its fields) after the data behind it changed"""
+    if _client is None:
+        return
+    try:
+        await _client.delete(key)
+    except Exception as e:
+        logger.warning("Cache invalidation failed for %s: %s", key, e)
+
+async def close_cache():
+    """Close the Redis connection pool"""
+    if _client is not None:
+        await _client.aclose()
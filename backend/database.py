@@ -1,6 +1,9 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 import os
 from dotenv import load_dotenv
 
@@ -9,30 +12,83 @@ load_dotenv()
 # Database configuration
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./dementia_detection.db")
 
-# Create SQLAlchemy engine
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
-)
+# Async drivers used by the API for each database backend
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
 
-# Create SessionLocal class
+def _async_url(url: str) -> str:
+    url = make_url(url)
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None:
+        return url.render_as_string(hide_password=False)
+    return url.set(drivername=f"{url.get_backend_name()}+{driver}").render_as_string(hide_password=False)
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", _async_url(DATABASE_URL))
+
+# Connection pool sizing (ignored for in-memory SQLite)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "32"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "64"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
+def _engine_options(url: str) -> dict:
+    if url.startswith("sqlite"):
+        options = {"connect_args": {"check_same_thread": False}}
+        if url in ("sqlite://", "sqlite:///:memory:"):
+            # An in-memory database lives in its connection, so share one
+            options["poolclass"] = StaticPool
+            return options
+    else:
+        options = {}
+    
+    # Connections are checked once at startup (check_connection), not on every checkout
+    options.update(
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=False
+    )
+    return options
+
+# Create SQLAlchemy engines: async for the API, sync for scripts (init_db.py)
+engine = create_engine(DATABASE_URL, **_engine_options(DATABASE_URL))
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **_engine_options(DATABASE_URL))
+
+# Create session classes
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Objects stay usable after commit, where a refresh would otherwise need an await
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
 # Create Base class
 Base = declarative_base()
 
 # Dependency to get DB session
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
+
+# Startup health probe
+async def check_connection():
+    async with async_engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+
+def _create_schema(connection):
+    from models import Base, backfill_progress_summaries
+    Base.metadata.create_all(bind=connection)
+    # create_all skips existing tables, so add indexes introduced since
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=connection, checkfirst=True)
+    # Summary rows for patients written before the summary table existed
+    backfill_progress_summaries(connection)
 
 # Function to create all tables
 def create_tables():
-    from models import Base
-    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        _create_schema(connection)
+
+# Same, through the async engine (API startup)
+async def create_tables_async():
+    async with async_engine.begin() as connection:
+        await connection.run_sync(_create_schema)
 
 # Function to drop all tables (for development/testing)
 def drop_tables():
@@ -0,0 +1,23 @@
+# Gunicorn settings for production: gunicorn -c gunicorn.conf.py main:app
+#
+# The app is imported and the NLP models are loaded once in the master before
+# forking, so every worker shares the model pages copy-on-write instead of
+# loading its own copy.
+
+import gc
+import multiprocessing
+import os
+
+bind = f"{os.getenv('API_HOST', '0.0.0.0')}:{os.getenv('API_PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+
+
+def when_ready(server):
+    # Runs in the master after the app is preloaded, before workers are forked
+    from main import nlp_service
+
+    nlp_service.load_models()
+    # Keep the garbage collector from touching (and un-sharing) these objects
+    gc.freeze()
@@ -6,6 +6,7 @@ Database initialization script for Dementia Detection System
 import sys
 import os
 from datetime import datetime, date
+from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 
 # Add the backend directory to Python path
@@ -20,6 +21,16 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def insert_missing(db, model, key_column, rows):
+    """Bulk insert rows whose key is not in the table yet, returning the inserted keys"""
+    keys = [row[key_column.key] for row in rows]
+    existing = set(db.scalars(select(key_column).where(key_column.in_(keys))))
+    new_rows = [row for row in rows if row[key_column.key] not in existing]
+    
+    if new_rows:
+        db.bulk_insert_mappings(model, new_rows)
+    return [row[key_column.key] for row in new_rows]
+
 def init_database():
     """Initialize database with tables"""
     logger.info("Creating database tables...")
@@ -140,25 +151,11 @@ def create_demo_patients():
         ]
         
         for patient_data in demo_patients:
-            # Check if patient already exists
-            existing_patient = db.query(Patient).filter(
-                Patient.patient_id == patient_data["patient_id"]
-            ).first()
-            
-            if existing_patient:
-                logger.info(f"Patient {patient_data['patient_id']} already exists")
-                continue
-            
-            # Create patient
-            patient = Patient(
-                doctor_id=demo_doctor.id,
-                **patient_data
-            )
-            
-            db.add(patient)
-            logger.info(f"Created demo patient: {patient_data['patient_id']}")
+            patient_data["doctor_id"] = demo_doctor.id
         
+        created = insert_missing(db, Patient, Patient.patient_id, demo_patients)
         db.commit()
+        logger.info(f"Created demo patients: {', '.join(created) or 'none (all exist)'}")
         logger.info("Demo patients created successfully!")
         
     except IntegrityError as e:
@@ -204,19 +201,7 @@ def create_system_settings():
             }
         ]
         
-        for setting_data in default_settings:
-            # Check if setting already exists
-            existing_setting = db.query(SystemSettings).filter(
-                SystemSettings.setting_key == setting_data["setting_key"]
-            ).first()
-            
-            if existing_setting:
-                continue
-            
-            # Create setting
-            setting = SystemSettings(**setting_data)
-            db.add(setting)
-        
+        insert_missing(db, SystemSettings, SystemSettings.setting_key, default_settings)
         db.commit()
         logger.info("System settings created successfully!")
         
@@ -272,14 +257,7 @@ def create_assessment_templates():
             }
         }
         
-        # Check if template exists
-        existing_template = db.query(AssessmentTemplate).filter(
-            AssessmentTemplate.template_name == memory_template["template_name"]
-        ).first()
-        
-        if not existing_template:
-            template = AssessmentTemplate(**memory_template)
-            db.add(template)
+        if insert_missing(db, AssessmentTemplate, AssessmentTemplate.template_name, [memory_template]):
             db.commit()
             logger.info("Memory assessment template created successfully!")
         else:
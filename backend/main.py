@@ -1,17 +1,28 @@
-from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi import FastAPI, Depends, HTTPException, Query, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update, or_, Sequence, lambda_stmt
+from sqlalchemy.ext.asyncio import AsyncSession
 from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import uvicorn
 from datetime import datetime, timedelta
-from typing import Optional, List
+from functools import lru_cache
+from typing import Optional, List, Dict, Any, Tuple
 import logging
 import os
+import time
+import uuid
+import orjson
 
 # Import custom modules
-from database import get_db, create_tables
-from models import User, Patient, Assessment, NLPAnalysis, ProgressTracking
+from database import get_db, create_tables_async, check_connection, AsyncSessionLocal, async_engine
+from models import (
+    User, Patient, Assessment, NLPAnalysis, ProgressTracking, ProgressSummary,
+    ASSESSMENT_COMPLETED, progress_counts, patient_id_seq, assessment_id_seq, nlp_analysis_id_seq
+)
 from auth import (
     authenticate_user, create_access_token, get_current_user, get_password_hash,
     ACCESS_TOKEN_EXPIRE_MINUTES
@@ -22,37 +33,76 @@ from schemas import (
     NLPPredictionRequest, NLPPredictionResponse
 )
 from nlp_service import NLPService
+from batching import MicroBatcher
+from cache import (
+    cached_json, cache_enabled, invalidate, close_cache, progress_key, nlp_key,
+    PROGRESS_CACHE_TTL_SECONDS, NLP_CACHE_TTL_SECONDS
+)
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper())
 logger = logging.getLogger(__name__)
 
 # Initialize NLP service
 nlp_service = NLPService()
 
+# spaCy and sklearn are CPU-bound; they run here instead of on the event loop.
+# One thread by default, since spaCy pipelines are not documented as thread-safe
+nlp_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("NLP_WORKER_THREADS", "1")),
+    thread_name_prefix="nlp"
+)
+
+async def _run_nlp(fn, *args):
+    """Run a blocking NLP call in the NLP thread pool"""
+    return await asyncio.get_running_loop().run_in_executor(nlp_executor, fn, *args)
+
+# Load the NLP models at startup instead of on the first analysis request
+PRELOAD_NLP_MODELS = os.getenv("PRELOAD_NLP_MODELS", "false").lower() == "true"
+
+# Timeline rows fetched per round trip when /progress streams its response
+PROGRESS_STREAM_CHUNK_ROWS = 200
+
+# Concurrent /nlp/analyze requests are analyzed together: one nlp.pipe pass,
+# one vectorizer call and one predict_proba per model for the whole batch
+analysis_batcher = MicroBatcher(
+    nlp_service.batch_analyze, max_batch_size=16, max_wait_ms=10, executor=nlp_executor
+)
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup: Create database tables
+    # Startup: Make sure the database is reachable before accepting traffic
+    await check_connection()
+    
+    # Create database tables
     logger.info("Creating database tables...")
-    create_tables()
+    await create_tables_async()
     logger.info("Database tables created successfully!")
     
-    # Load ML models
-    logger.info("Loading NLP models...")
-    nlp_service.load_models()
-    logger.info("NLP models loaded successfully!")
+    # NLP models load on first use (nlp_service.ensure_loaded), in the
+    # gunicorn master before forking so workers share them, or here when
+    # PRELOAD_NLP_MODELS asks for a warm pipeline before the first request
+    if PRELOAD_NLP_MODELS:
+        await nlp_service.ensure_loaded()
+    
+    analysis_batcher.start()
     
     yield
     
     # Shutdown: cleanup if needed
     logger.info("Shutting down...")
+    await analysis_batcher.stop()
+    await async_engine.dispose()
+    await close_cache()
 
 # Create FastAPI app
 app = FastAPI(
     title="Dementia Detection API",
     description="FastAPI backend for Dementia/Alzheimer's Detection System with NLP analysis",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # orjson encodes responses (datetimes included) in C
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
@@ -64,21 +114,55 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Upper bound for the limit parameter of paged endpoints
+MAX_PAGE_SIZE = 1000
+
 # OAuth2 scheme
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token")
 
+async def _add_with_public_id(db: AsyncSession, obj, public_id_attr: str, prefix: str, sequence: Sequence):
+    """Add obj with its primary key and the public id derived from it (P001, A001, NLP001)"""
+    if db.bind.dialect.supports_sequences:
+        obj.id = await db.scalar(select(sequence.next_value()))
+    else:
+        # SQLite/MySQL: the database assigns the key on INSERT, which is safe
+        # across worker processes; the public id is filled in before commit
+        setattr(obj, public_id_attr, uuid.uuid4().hex[:20])
+        db.add(obj)
+        await db.flush()
+    setattr(obj, public_id_attr, f"{prefix}{obj.id:03d}")
+    db.add(obj)
+
+# The lookups below use lambda_stmt so their compiled SQL is cached by the
+# lambda's code location; patient_id/doctor_id become bound parameters.
+async def _get_owned_patient(db: AsyncSession, patient_id: str, doctor_id: int) -> Optional[Patient]:
+    """Get a patient that belongs to the given doctor"""
+    stmt = lambda_stmt(lambda: select(Patient).where(
+        Patient.patient_id == patient_id,
+        Patient.doctor_id == doctor_id
+    ))
+    return (await db.execute(stmt)).scalar_one_or_none()
+
+async def _patient_exists(db: AsyncSession, patient_id: str, doctor_id: int) -> bool:
+    """Check that a patient exists and belongs to the given doctor"""
+    stmt = lambda_stmt(lambda: select(Patient.id).where(
+        Patient.patient_id == patient_id,
+        Patient.doctor_id == doctor_id
+    ))
+    return (await db.execute(stmt)).first() is not None
+
 # ============================================================================
 # AUTHENTICATION ENDPOINTS
 # ============================================================================
 
 @app.post("/auth/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-async def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register_user(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
     """Register a new user (doctor/clinician)"""
     
     # Check if user already exists
-    existing_user = db.query(User).filter(
-        (User.username == user_data.username) | (User.email == user_data.email)
-    ).first()
+    existing_user = (await db.execute(
+        select(User.id).where(or_(User.username == user_data.username, User.email == user_data.email))
+    )).first()
     
     if existing_user:
         raise HTTPException(
@@ -97,20 +181,20 @@ async def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
     )
     
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     
-    logger.info(f"New user registered: {db_user.username}")
+    logger.info("New user registered: %s", db_user.username)
     return db_user
 
 @app.post("/auth/token", response_model=Token)
 async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Authenticate user and return access token"""
     
-    user = authenticate_user(db, form_data.username, form_data.password)
+    user = await authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -123,7 +207,7 @@ async def login_for_access_token(
         data={"sub": user.username}, expires_delta=access_token_expires
     )
     
-    logger.info(f"User logged in: {user.username}")
+    logger.info("User logged in: %s", user.username)
     return {"access_token": access_token, "token_type": "bearer"}
 
 @app.get("/auth/me", response_model=UserResponse)
@@ -139,55 +223,53 @@ async def read_users_me(current_user: User = Depends(get_current_user)):
 async def create_patient(
     patient_data: PatientCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a new patient record"""
     
-    # Generate unique patient ID
-    last_patient = db.query(Patient).order_by(Patient.id.desc()).first()
-    patient_id = f"P{(last_patient.id + 1):03d}" if last_patient else "P001"
-    
     db_patient = Patient(
-        patient_id=patient_id,
         doctor_id=current_user.id,
-        **patient_data.dict()
+        **patient_data.model_dump()
     )
     
-    db.add(db_patient)
-    db.commit()
-    db.refresh(db_patient)
+    # Generate unique patient ID
+    await _add_with_public_id(db, db_patient, "patient_id", "P", patient_id_seq)
+    await db.commit()
+    await db.refresh(db_patient)
     
-    logger.info(f"New patient created: {db_patient.patient_id}")
+    logger.info("New patient created: %s", db_patient.patient_id)
     return db_patient
 
 @app.get("/patients", response_model=List[PatientResponse])
 async def get_patients(
-    skip: int = 0,
-    limit: int = 100,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get all patients for the current doctor"""
     
-    patients = db.query(Patient).filter(
-        Patient.doctor_id == current_user.id,
-        Patient.is_active == True
-    ).offset(skip).limit(limit).all()
-    
-    return patients
+    # Plain Core rows: no ORM identity map or instrumented objects per row
+    patients = (await db.execute(
+        select(Patient.__table__).where(
+            Patient.doctor_id == current_user.id,
+            Patient.is_active == True
+        ).offset(skip).limit(limit)
+    )).mappings().all()
+    
+    # Rows are trusted: a Response skips FastAPI re-validating each one against
+    # response_model, which still documents the schema
+    return ORJSONResponse([PatientResponse.row_dict(row) for row in patients])
 
 @app.get("/patients/{patient_id}", response_model=PatientResponse)
 async def get_patient(
     patient_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get a specific patient by ID"""
     
-    patient = db.query(Patient).filter(
-        Patient.patient_id == patient_id,
-        Patient.doctor_id == current_user.id
-    ).first()
+    patient = await _get_owned_patient(db, patient_id, current_user.id)
     
     if not patient:
         raise HTTPException(
@@ -202,58 +284,81 @@ async def update_patient(
     patient_id: str,
     patient_data: PatientCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Update patient information"""
     
-    patient = db.query(Patient).filter(
-        Patient.patient_id == patient_id,
-        Patient.doctor_id == current_user.id
-    ).first()
+    # Single UPDATE scoped to the owner; only fields sent by the client
+    updates = patient_data.model_dump(exclude_unset=True)
+    updates["updated_at"] = datetime.utcnow()
     
-    if not patient:
+    result = await db.execute(
+        update(Patient).where(
+            Patient.patient_id == patient_id,
+            Patient.doctor_id == current_user.id
+        ).values(**updates).execution_options(synchronize_session=False)
+    )
+    
+    if not result.rowcount:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Patient not found"
         )
     
-    for field, value in patient_data.dict().items():
-        setattr(patient, field, value)
-    
-    patient.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(patient)
+    await db.commit()
+    patient = await _get_owned_patient(db, patient_id, current_user.id)
     
-    logger.info(f"Patient updated: {patient.patient_id}")
+    logger.info("Patient updated: %s", patient.patient_id)
     return patient
 
 # ============================================================================
 # NLP ANALYSIS ENDPOINTS
 # ============================================================================
 
+@lru_cache(maxsize=1024)
+def _analyze_demo_text(text: str) -> Dict[str, Any]:
+    """Run NLP analysis, reusing the result for repeated demo transcripts"""
+    return nlp_service.analyze_text(text)
+
+async def _analyze_text_batched(text: str) -> Dict[str, Any]:
+    """Run NLP analysis as part of a batch with concurrent requests"""
+    await nlp_service.ensure_loaded()
+    result = await analysis_batcher.submit(text)
+    if "error" in result:
+        raise ValueError(result["error"])
+    return result
+
+def _prediction_response(analysis_id: str, analysis_result: Dict[str, Any],
+                         processing_time: int) -> ORJSONResponse:
+    """NLPPredictionResponse body built from nlp_service's (already typed) result, unvalidated"""
+    return ORJSONResponse({
+        "analysis_id": analysis_id,
+        "prediction": analysis_result["prediction"],
+        "confidence": analysis_result["confidence"],
+        "control_probability": analysis_result["control_probability"],
+        "alzheimer_probability": analysis_result["alzheimer_probability"],
+        "risk_level": analysis_result["risk_level"],
+        "clinical_interpretation": analysis_result["clinical_interpretation"],
+        "linguistic_features": analysis_result["linguistic_features"],
+        "processing_time_ms": processing_time
+    })
+
 @app.post("/nlp/demo", response_model=NLPPredictionResponse)
 async def analyze_text_demo(request: NLPPredictionRequest):
     """Demo endpoint - Analyze text without authentication for testing"""
     try:
         # Perform NLP analysis without authentication
-        start_time = datetime.now()
-        analysis_result = nlp_service.analyze_text(request.text)
-        end_time = datetime.now()
+        await nlp_service.ensure_loaded()
+        start = time.perf_counter_ns()
+        analysis_result = await _run_nlp(_analyze_demo_text, request.text)
+        processing_time = (time.perf_counter_ns() - start) // 1_000_000
         
-        return NLPPredictionResponse(
-            analysis_id=f"DEMO{datetime.now().strftime('%Y%m%d%H%M%S')}",
-            prediction=analysis_result["prediction"],
-            confidence=analysis_result["confidence"],
-            control_probability=analysis_result["control_probability"],
-            alzheimer_probability=analysis_result["alzheimer_probability"],
-            risk_level=analysis_result["risk_level"],
-            clinical_interpretation=analysis_result["clinical_interpretation"],
-            linguistic_features=analysis_result["linguistic_features"],
-            processing_time_ms=int((end_time - start_time).total_seconds() * 1000)
+        return _prediction_response(
+            f"DEMO{datetime.now().strftime('%Y%m%d%H%M%S')}", analysis_result, processing_time
         )
         
     except Exception as e:
-        logger.error(f"Error in NLP analysis demo: {str(e)}")
+        logger.error("Error in NLP analysis demo: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Analysis failed: {str(e)}"
@@ -263,7 +368,7 @@ async def analyze_text_demo(request: NLPPredictionRequest):
 async def analyze_text(
     request: NLPPredictionRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Analyze text for Alzheimer's/dementia indicators using NLP model"""
     
@@ -271,10 +376,7 @@ async def analyze_text(
         # Get patient if patient_id is provided
         patient = None
         if request.patient_id:
-            patient = db.query(Patient).filter(
-                Patient.patient_id == request.patient_id,
-                Patient.doctor_id == current_user.id
-            ).first()
+            patient = await _get_owned_patient(db, request.patient_id, current_user.id)
             
             if not patient:
                 raise HTTPException(
@@ -282,19 +384,17 @@ async def analyze_text(
                     detail="Patient not found"
                 )
         
-        # Perform NLP analysis
-        start_time = datetime.now()
-        analysis_result = nlp_service.analyze_text(request.text)
-        end_time = datetime.now()
-        processing_time = int((end_time - start_time).total_seconds() * 1000)
-        
-        # Generate analysis ID
-        last_analysis = db.query(NLPAnalysis).order_by(NLPAnalysis.id.desc()).first()
-        analysis_id = f"NLP{(last_analysis.id + 1):03d}" if last_analysis else "NLP001"
+        # Perform NLP analysis (repeated transcripts come from the cache)
+        start = time.perf_counter_ns()
+        analysis_result = await cached_json(
+            nlp_key(request.text),
+            NLP_CACHE_TTL_SECONDS,
+            lambda: _analyze_text_batched(request.text)
+        )
+        processing_time = (time.perf_counter_ns() - start) // 1_000_000
         
-        # Save to database
+        # Save to database before answering, so the returned ID always exists
         db_analysis = NLPAnalysis(
-            analysis_id=analysis_id,
             patient_id=patient.id if patient else None,
             assessment_id=request.assessment_id,
             original_text=request.text,
@@ -310,26 +410,18 @@ async def analyze_text(
             clinical_notes=analysis_result["clinical_interpretation"]
         )
         
-        db.add(db_analysis)
-        db.commit()
-        db.refresh(db_analysis)
+        # Generate analysis ID
+        await _add_with_public_id(db, db_analysis, "analysis_id", "NLP", nlp_analysis_id_seq)
+        await db.commit()
+        if patient:
+            await invalidate(progress_key(current_user.id, patient.patient_id))
         
-        logger.info(f"NLP analysis completed: {db_analysis.analysis_id}")
+        logger.info("NLP analysis completed: %s", db_analysis.analysis_id)
         
-        return NLPPredictionResponse(
-            analysis_id=db_analysis.analysis_id,
-            prediction=analysis_result["prediction"],
-            confidence=analysis_result["confidence"],
-            control_probability=analysis_result["control_probability"],
-            alzheimer_probability=analysis_result["alzheimer_probability"],
-            risk_level=analysis_result["risk_level"],
-            clinical_interpretation=analysis_result["clinical_interpretation"],
-            linguistic_features=analysis_result["linguistic_features"],
-            processing_time_ms=processing_time
-        )
+        return _prediction_response(db_analysis.analysis_id, analysis_result, processing_time)
         
     except Exception as e:
-        logger.error(f"Error in NLP analysis: {str(e)}")
+        logger.error("Error in NLP analysis: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error processing text: {str(e)}"
@@ -338,30 +430,29 @@ async def analyze_text(
 @app.get("/nlp/analyses/{patient_id}", response_model=List[NLPAnalysisResponse])
 async def get_patient_analyses(
     patient_id: str,
-    skip: int = 0,
-    limit: int = 50,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get all NLP analyses for a specific patient"""
     
-    # Verify patient exists and belongs to current user
-    patient = db.query(Patient).filter(
-        Patient.patient_id == patient_id,
-        Patient.doctor_id == current_user.id
-    ).first()
+    # Ownership check and fetch in one query, as plain Core rows
+    analyses = (await db.execute(
+        select(NLPAnalysis.__table__).join(Patient.__table__).where(
+            Patient.patient_id == patient_id,
+            Patient.doctor_id == current_user.id
+        ).order_by(NLPAnalysis.created_at.desc()).offset(skip).limit(limit)
+    )).mappings().all()
     
-    if not patient:
+    # An empty page can still belong to an existing patient
+    if not analyses and not await _patient_exists(db, patient_id, current_user.id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Patient not found"
         )
     
-    analyses = db.query(NLPAnalysis).filter(
-        NLPAnalysis.patient_id == patient.id
-    ).order_by(NLPAnalysis.created_at.desc()).offset(skip).limit(limit).all()
-    
-    return analyses
+    return ORJSONResponse([NLPAnalysisResponse.row_dict(row) for row in analyses])
 
 # ============================================================================
 # ASSESSMENT ENDPOINTS
@@ -371,15 +462,12 @@ async def get_patient_analyses(
 async def create_assessment(
     assessment_data: AssessmentCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a new assessment record"""
     
     # Verify patient exists and belongs to current user
-    patient = db.query(Patient).filter(
-        Patient.patient_id == assessment_data.patient_id,
-        Patient.doctor_id == current_user.id
-    ).first()
+    patient = await _get_owned_patient(db, assessment_data.patient_id, current_user.id)
     
     if not patient:
         raise HTTPException(
@@ -387,72 +475,62 @@ async def create_assessment(
             detail="Patient not found"
         )
     
-    # Generate assessment ID
-    last_assessment = db.query(Assessment).order_by(Assessment.id.desc()).first()
-    assessment_id = f"A{(last_assessment.id + 1):03d}" if last_assessment else "A001"
-    
     db_assessment = Assessment(
-        assessment_id=assessment_id,
         patient_id=patient.id,
-        **assessment_data.dict(exclude={"patient_id"})
+        **assessment_data.model_dump(exclude={"patient_id"})
     )
     
-    db.add(db_assessment)
-    db.commit()
-    db.refresh(db_assessment)
+    # Generate assessment ID
+    await _add_with_public_id(db, db_assessment, "assessment_id", "A", assessment_id_seq)
+    await db.commit()
+    await db.refresh(db_assessment)
+    await invalidate(progress_key(current_user.id, patient.patient_id))
     
-    logger.info(f"New assessment created: {db_assessment.assessment_id}")
+    logger.info("New assessment created: %s", db_assessment.assessment_id)
     return db_assessment
 
 @app.get("/assessments/{patient_id}", response_model=List[AssessmentResponse])
 async def get_patient_assessments(
     patient_id: str,
     assessment_type: Optional[str] = None,
-    skip: int = 0,
-    limit: int = 50,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get all assessments for a specific patient"""
     
-    # Verify patient exists and belongs to current user
-    patient = db.query(Patient).filter(
+    # Ownership check and fetch in one query, as plain Core rows
+    query = select(Assessment.__table__).join(Patient.__table__).where(
         Patient.patient_id == patient_id,
         Patient.doctor_id == current_user.id
-    ).first()
+    )
     
-    if not patient:
+    if assessment_type:
+        query = query.where(Assessment.assessment_type == assessment_type)
+    
+    assessments = (await db.execute(
+        query.order_by(Assessment.created_at.desc()).offset(skip).limit(limit)
+    )).mappings().all()
+    
+    # An empty page can still belong to an existing patient
+    if not assessments and not await _patient_exists(db, patient_id, current_user.id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Patient not found"
         )
     
-    query = db.query(Assessment).filter(Assessment.patient_id == patient.id)
-    
-    if assessment_type:
-        query = query.filter(Assessment.assessment_type == assessment_type)
-    
-    assessments = query.order_by(Assessment.created_at.desc()).offset(skip).limit(limit).all()
-    
-    return assessments
+    return ORJSONResponse([AssessmentResponse.row_dict(row) for row in assessments])
 
 # ============================================================================
 # PROGRESS TRACKING ENDPOINTS
 # ============================================================================
 
-@app.get("/progress/{patient_id}")
-async def get_patient_progress(
-    patient_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    """Get progress tracking data for a patient"""
+async def _progress_totals(db: AsyncSession, patient_id: str, doctor_id: int) -> Tuple[int, int, int]:
+    """Return (patient row id, completed assessment count, NLP analysis count)"""
     
     # Verify patient exists and belongs to current user
-    patient = db.query(Patient).filter(
-        Patient.patient_id == patient_id,
-        Patient.doctor_id == current_user.id
-    ).first()
+    patient = await _get_owned_patient(db, patient_id, doctor_id)
     
     if not patient:
         raise HTTPException(
@@ -460,42 +538,134 @@ async def get_patient_progress(
             detail="Patient not found"
         )
     
-    # Get assessments over time
-    assessments = db.query(Assessment).filter(
-        Assessment.patient_id == patient.id,
-        Assessment.status == "completed"
-    ).order_by(Assessment.completed_at).all()
-    
-    # Get NLP analyses over time
-    nlp_analyses = db.query(NLPAnalysis).filter(
-        NLPAnalysis.patient_id == patient.id
-    ).order_by(NLPAnalysis.created_at).all()
+    # Totals are maintained at write time (models.refresh_progress_summary)
+    totals_stmt = (
+        select(ProgressSummary.assessment_count, ProgressSummary.nlp_analysis_count)
+        .where(ProgressSummary.patient_id == patient.id)
+    )
+    totals = (await db.execute(totals_stmt)).one_or_none()
+    if totals is None:
+        # No summary row yet (database._create_schema backfills them): count
+        # directly, without writing from a read endpoint
+        counts = progress_counts(patient.id)
+        totals = (await db.execute(select(
+            counts["assessment_count"].label("assessment_count"),
+            counts["nlp_analysis_count"].label("nlp_analysis_count")
+        ))).one()
+    
+    return patient.id, totals.assessment_count, totals.nlp_analysis_count
+
+def _timeline_statements(patient_row_id: int, skip: int, limit: Optional[int]) -> Tuple[Any, Any]:
+    """Queries for one page of the assessment and NLP timelines, timeline columns only"""
+    assessments = (
+        select(Assessment.completed_at, Assessment.assessment_type, Assessment.total_score)
+        .where(Assessment.patient_id == patient_row_id, ASSESSMENT_COMPLETED)
+        .order_by(Assessment.completed_at).offset(skip).limit(limit)
+    )
+    nlp_analyses = (
+        select(NLPAnalysis.created_at, NLPAnalysis.confidence_score, NLPAnalysis.risk_level, NLPAnalysis.prediction)
+        .where(NLPAnalysis.patient_id == patient_row_id)
+        .order_by(NLPAnalysis.created_at).offset(skip).limit(limit)
+    )
+    return assessments, nlp_analyses
+
+def _assessment_timeline_item(assessment) -> Dict[str, Any]:
+    return {
+        "date": assessment.completed_at,
+        "type": assessment.assessment_type,
+        "score": assessment.total_score
+    }
+
+def _nlp_timeline_item(analysis) -> Dict[str, Any]:
+    return {
+        "date": analysis.created_at,
+        "confidence": analysis.confidence_score,
+        "risk_level": analysis.risk_level,
+        "prediction": analysis.prediction
+    }
+
+async def _load_progress(db: AsyncSession, patient_id: str, doctor_id: int,
+                         skip: int, limit: int) -> Dict[str, Any]:
+    """Build the progress timelines for a patient owned by the given doctor"""
+    patient_row_id, assessment_count, nlp_analysis_count = await _progress_totals(db, patient_id, doctor_id)
+    assessments_stmt, nlp_analyses_stmt = _timeline_statements(patient_row_id, skip, limit)
     
-    # Calculate progress metrics
-    progress_data = {
+    return {
         "patient_id": patient_id,
-        "assessment_count": len(assessments),
-        "nlp_analysis_count": len(nlp_analyses),
+        "assessment_count": assessment_count,
+        "nlp_analysis_count": nlp_analysis_count,
         "assessment_timeline": [
-            {
-                "date": assessment.completed_at.isoformat() if assessment.completed_at else None,
-                "type": assessment.assessment_type,
-                "score": assessment.total_score
-            }
-            for assessment in assessments
+            _assessment_timeline_item(row) for row in (await db.execute(assessments_stmt)).all()
         ],
         "nlp_timeline": [
-            {
-                "date": analysis.created_at.isoformat(),
-                "confidence": analysis.confidence_score,
-                "risk_level": analysis.risk_level,
-                "prediction": analysis.prediction
-            }
-            for analysis in nlp_analyses
+            _nlp_timeline_item(row) for row in (await db.execute(nlp_analyses_stmt)).all()
         ]
     }
+
+async def _stream_progress(header: Dict[str, Any], assessments_stmt, nlp_analyses_stmt):
+    """Yield the progress JSON in pieces, fetching the timeline rows in chunks"""
+    # The header object without its closing brace, then one array per timeline
+    yield orjson.dumps(header)[:-1]
+    
+    # The request's session may already be closed while the body streams
+    async with AsyncSessionLocal() as db:
+        for name, stmt, to_item in (
+            ("assessment_timeline", assessments_stmt, _assessment_timeline_item),
+            ("nlp_timeline", nlp_analyses_stmt, _nlp_timeline_item),
+        ):
+            yield f',"{name}":['.encode()
+            separator = b""
+            result = await db.stream(stmt.execution_options(yield_per=PROGRESS_STREAM_CHUNK_ROWS))
+            async for rows in result.partitions():
+                yield separator + b",".join(orjson.dumps(to_item(row)) for row in rows)
+                separator = b","
+            yield b"]"
+    
+    yield b"}"
+
+async def _progress_stream_response(db: AsyncSession, patient_id: str, doctor_id: int,
+                                    skip: int, limit: Optional[int]) -> StreamingResponse:
+    """Stream one page of the progress timelines (all of them when limit is None)"""
+    # Ownership and totals are resolved first, so a 404 is still a plain error
+    patient_row_id, assessment_count, nlp_analysis_count = await _progress_totals(db, patient_id, doctor_id)
+    header = {
+        "patient_id": patient_id,
+        "assessment_count": assessment_count,
+        "nlp_analysis_count": nlp_analysis_count
+    }
+    return StreamingResponse(
+        _stream_progress(header, *_timeline_statements(patient_row_id, skip, limit)),
+        media_type="application/json"
+    )
+
+@app.get("/progress/{patient_id}")
+async def get_patient_progress(
+    patient_id: str,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get progress tracking data for a patient"""
+    if cache_enabled():
+        # Cached pages are stored and served whole
+        return await cached_json(
+            progress_key(current_user.id, patient_id),
+            PROGRESS_CACHE_TTL_SECONDS,
+            lambda: _load_progress(db, patient_id, current_user.id, skip, limit),
+            field=f"{skip}:{limit}"
+        )
     
-    return progress_data
+    return await _progress_stream_response(db, patient_id, current_user.id, skip, limit)
+
+@app.get("/progress/{patient_id}/stream")
+async def stream_patient_progress(
+    patient_id: str,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Stream a patient's complete progress timelines, bypassing the page cache"""
+    return await _progress_stream_response(db, patient_id, current_user.id, 0, None)
 
 # ============================================================================
 # HEALTH CHECK ENDPOINTS
@@ -507,19 +677,34 @@ async def root():
     return {
         "message": "Dementia Detection API is running",
         "version": "1.0.0",
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": datetime.utcnow()
     }
 
-@app.get("/health")
-async def health_check():
-    """Detailed health check"""
+# Liveness probes hit /health every second or so; the body is rebuilt at most
+# once per HEALTH_CACHE_SECONDS (or when the models finish loading)
+HEALTH_CACHE_SECONDS = 5
+
+@lru_cache(maxsize=1)
+def _health_snapshot(bucket: int, models_loaded: bool) -> Dict[str, Any]:
     return {
         "status": "healthy",
         "services": {
             "database": "connected",
-            "nlp_models": "loaded" if nlp_service.models_loaded else "not_loaded"
+            "nlp_models": "loaded" if models_loaded else "not_loaded"
         },
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": datetime.utcnow()
+    }
+
+@app.get("/health")
+async def health_check():
+    """Detailed health check"""
+    return _health_snapshot(int(time.time()) // HEALTH_CACHE_SECONDS, nlp_service.models_loaded)
+
+@app.get("/metrics")
+async def metrics():
+    """Cache statistics"""
+    return {
+        "demo_analysis_cache": _analyze_demo_text.cache_info()._asdict()
     }
 
 # ============================================================================
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Model storage helpers for the sklearn classifiers
+
+The `.pkl` files hold `(model, weights)` tuples. Running this script folds
+the weights into each model, casts it to float32 and dumps the ready-to-use
+model uncompressed with joblib as a `.joblib` file. Those load with
+`mmap_mode='r'`: the arrays are mapped read-only from the page cache and
+shared between worker processes instead of being copied into each heap, so
+nothing may replace them after loading.
+"""
+
+import logging
+import pickle
+from pathlib import Path
+
+import joblib
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MODEL_NAMES = ["model_control", "model_alz"]
+
+
+def _joblib_path(name: str) -> Path:
+    return Path(f"{name}.joblib")
+
+
+def save_joblib_model(obj, name: str) -> Path:
+    """Dump obj uncompressed so its arrays can be memory-mapped on load"""
+    target = _joblib_path(name)
+    joblib.dump(obj, target, compress=0)
+    return target
+
+
+def load_model(name: str):
+    """Load a ready-to-use model, preferring the memory-mapped joblib file over the plain pickle"""
+    source = _joblib_path(name)
+    pickled = Path(f"{name}.pkl")
+    if source.is_file():
+        if not pickled.is_file() or source.stat().st_mtime >= pickled.stat().st_mtime:
+            # Prepared by convert_models(): the mapped coef_ is used as is
+            return joblib.load(source, mmap_mode="r")
+        # A retrained model must not be shadowed by the dump of the old one
+        logger.warning("%s is newer than %s; loading the pickle (rerun model_io.py)", pickled, source)
+
+    with open(pickled, "rb") as f:
+        return prepare_model(*pickle.load(f))
+
+
+def fold_weights(model, weights):
+    """Fold per-feature weights into a linear model's coefficients
+
+    Afterwards model.predict_proba(X) equals the original
+    model.predict_proba(X.multiply(weights)), so requests skip the multiply.
+    """
+    model.coef_ = np.multiply(model.coef_, np.asarray(weights))
+    return model
+
+
+def cast_float32(model):
+    """Store a linear model's coefficients as float32
+
+    Halves the bytes read by the sparse-dense dot product in predict_proba.
+    Features should be float32 too, or scipy upcasts coef_ on every call.
+    """
+    model.coef_ = model.coef_.astype(np.float32)
+    model.intercept_ = model.intercept_.astype(np.float32)
+    return model
+
+
+def prepare_model(model, weights):
+    """Turn a pickled (model, weights) pair into the model as it is served"""
+    return cast_float32(fold_weights(model, weights))
+
+
+def convert_models():
+    """Convert the plain model pickles to prepared, memory-mappable joblib files"""
+    for name in MODEL_NAMES:
+        with open(f"{name}.pkl", "rb") as f:
+            model, weights = pickle.load(f)
+        # fold_weights() leaves plain ndarrays, which joblib can memory-map
+        target = save_joblib_model(prepare_model(model, weights), name)
+        print(f"Converted {name}.pkl -> {target}")
+
+
+if __name__ == "__main__":
+    convert_models()
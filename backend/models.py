@@ -1,4 +1,6 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, Float, Boolean, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, DateTime, Text, Float, Boolean, ForeignKey, JSON, Sequence, Index
+from sqlalchemy import event, inspect, literal, select, text
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -6,6 +8,12 @@ from sqlalchemy.sql import func
 
 Base = declarative_base()
 
+# Sequences backing the SERIAL primary keys on PostgreSQL. The public
+# P001/A001/NLP001 identifiers are minted from the next value.
+patient_id_seq = Sequence("patients_id_seq")
+assessment_id_seq = Sequence("assessments_id_seq")
+nlp_analysis_id_seq = Sequence("nlp_analyses_id_seq")
+
 class User(Base):
     __tablename__ = "users"
     
@@ -24,6 +32,11 @@ class User(Base):
 
 class Patient(Base):
     __tablename__ = "patients"
+    __table_args__ = (
+        # patient_id alone is covered by its unique index; doctor_id leads so
+        # per-doctor listings can range-scan too
+        Index("ix_patient_doctor_pid", "doctor_id", "patient_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     patient_id = Column(String(20), unique=True, index=True, nullable=False)  # P001, P002, etc.
@@ -53,6 +66,20 @@ class Patient(Base):
 
 class Assessment(Base):
     __tablename__ = "assessments"
+    __table_args__ = (
+        # Partial index over completed assessments only, which is all
+        # /progress reads; on PostgreSQL the INCLUDE columns make its
+        # timeline an index-only scan. Queries must compare status with an
+        # inlined literal (ASSESSMENT_COMPLETED) for the planner to use it.
+        Index(
+            "ix_assess_completed_by_patient", "patient_id", "completed_at",
+            postgresql_include=["assessment_type", "total_score"],
+            postgresql_where=text("status = 'completed'"),
+            sqlite_where=text("status = 'completed'")
+        ),
+        # Per-patient assessment listing, newest first
+        Index("ix_assess_patient_created", "patient_id", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     assessment_id = Column(String(20), unique=True, index=True, nullable=False)  # A001, A002, etc.
@@ -100,8 +127,17 @@ class Assessment(Base):
     # Relationships
     patient = relationship("Patient", back_populates="assessments")
 
+# Inlined rather than bound, so it matches the partial index predicate
+ASSESSMENT_COMPLETED = Assessment.status == literal("completed", literal_execute=True)
+
 class NLPAnalysis(Base):
     __tablename__ = "nlp_analyses"
+    __table_args__ = (
+        Index(
+            "ix_nlp_timeline", "patient_id", "created_at",
+            postgresql_include=["confidence_score", "risk_level", "prediction"]
+        ),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     analysis_id = Column(String(20), unique=True, index=True, nullable=False)  # NLP001, NLP002, etc.
@@ -184,6 +220,15 @@ class ProgressTracking(Base):
     # Relationships
     patient = relationship("Patient")
 
+class ProgressSummary(Base):
+    """Per-patient totals for /progress, kept current as records are written"""
+    __tablename__ = "progress_summaries"
+    
+    patient_id = Column(Integer, ForeignKey("patients.id"), primary_key=True)
+    assessment_count = Column(Integer, nullable=False, default=0)  # Completed assessments
+    nlp_analysis_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
 class SystemSettings(Base):
     __tablename__ = "system_settings"
     
@@ -212,4 +257,83 @@ class AssessmentTemplate(Base):
     
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
\ No newline at end of file
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+# Progress summaries are refreshed in the same transaction as the assessment or
+# analysis write, so /progress reads its totals with a primary-key lookup.
+# The totals are recounted (an index range count) rather than incremented,
+# which keeps them right for patients whose rows predate the summary table.
+
+_UPSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+def progress_counts(patient_id):
+    """COUNT subqueries for a patient's summary columns (patient_id may be a column)"""
+    return {
+        "assessment_count": select(func.count()).select_from(Assessment.__table__).where(
+            Assessment.patient_id == patient_id, ASSESSMENT_COMPLETED
+        ).scalar_subquery(),
+        "nlp_analysis_count": select(func.count()).select_from(NLPAnalysis.__table__).where(
+            NLPAnalysis.patient_id == patient_id
+        ).scalar_subquery(),
+    }
+
+def backfill_progress_summaries(connection):
+    """Create the summary rows missing for existing patients, in one INSERT ... SELECT"""
+    summaries = ProgressSummary.__table__
+    patients = Patient.__table__
+    counts = progress_counts(patients.c.id)
+    missing = select(
+        patients.c.id, counts["assessment_count"], counts["nlp_analysis_count"],
+        literal(datetime.utcnow())
+    ).where(~select(summaries.c.patient_id).where(summaries.c.patient_id == patients.c.id).exists())
+    columns = ["patient_id", "assessment_count", "nlp_analysis_count", "updated_at"]
+    upsert = _UPSERTS.get(connection.dialect.name)
+    if upsert is not None:
+        # Workers starting together may backfill at once; the first one wins
+        connection.execute(upsert(summaries).from_select(columns, missing).on_conflict_do_nothing())
+    else:
+        connection.execute(summaries.insert().from_select(columns, missing))
+
+def refresh_progress_summary(connection, patient_id: int):
+    """Recount a patient's completed assessments and NLP analyses into its summary row"""
+    summaries = ProgressSummary.__table__
+    
+    # Concurrent writers for one patient recount one at a time. Under READ
+    # COMMITTED the COUNTs below then run after the previous writer committed,
+    # so neither misses the other's row. NO KEY UPDATE (key_share) does not
+    # conflict with the KEY SHARE lock each writer's foreign key insert holds on
+    # the patient row. SQLite renders no lock; it serializes writers anyway.
+    connection.execute(
+        select(Patient.__table__.c.id).where(Patient.__table__.c.id == patient_id)
+        .with_for_update(key_share=True)
+    )
+    
+    values = {**progress_counts(patient_id), "updated_at": datetime.utcnow()}
+    
+    upsert = _UPSERTS.get(connection.dialect.name)
+    if upsert is not None:
+        statement = upsert(summaries).values(patient_id=patient_id, **values)
+        connection.execute(statement.on_conflict_do_update(
+            index_elements=[summaries.c.patient_id],
+            set_={name: statement.excluded[name] for name in values}
+        ))
+        return
+    
+    if connection.execute(
+        summaries.update().where(summaries.c.patient_id == patient_id).values(**values)
+    ).rowcount == 0:
+        connection.execute(summaries.insert().values(patient_id=patient_id, **values))
+
+@event.listens_for(Assessment, "after_insert")
+@event.listens_for(Assessment, "after_delete")
+@event.listens_for(NLPAnalysis, "after_insert")
+@event.listens_for(NLPAnalysis, "after_delete")
+def _refresh_summary_on_write(mapper, connection, target):
+    if target.patient_id is not None:
+        refresh_progress_summary(connection, target.patient_id)
+
+@event.listens_for(Assessment, "after_update")
+def _refresh_summary_on_status_change(mapper, connection, target):
+    # Only completed assessments are counted
+    if inspect(target).attrs.status.history.has_changes():
+        refresh_progress_summary(connection, target.patient_id)
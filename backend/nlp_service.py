@@ -1,26 +1,56 @@
-import pickle
+import asyncio
 import dill
 import spacy
+from spacy.tokens import Doc
 import re
 import string
+import sys
+import threading
 import time
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List, Tuple, TypedDict
 import logging
 from pathlib import Path
+import numpy as np
+from scipy import sparse
+from spacy.attrs import IS_ALPHA, IS_PUNCT, IS_SPACE, LOWER, POS
+from model_io import load_model
 
 logger = logging.getLogger(__name__)
 
+# Same character class as the tokenizer the vectorizer was fitted with
+# (vectorizor.py), compiled once instead of on every tokenizer call
+_PUNCT_RE = re.compile(f'([{string.punctuation}“”¨«»®´·º½¾¿¡§£₤‘’])')
+
+# Columns of the doc.to_array() table used by _extract_linguistic_features
+_FEATURE_ATTRS = [IS_SPACE, IS_PUNCT, IS_ALPHA, POS, LOWER]
+
+class LinguisticFeatureCounts(TypedDict):
+    """Linguistic features of a text, as sent in responses (schemas.LinguisticFeatures)"""
+    word_count: int
+    sentence_count: int
+    avg_words_per_sentence: float
+    lexical_diversity: float
+    pos_distribution: Dict[str, int]
+
+def _pad_match(match: re.Match) -> str:
+    return f' {match[0]} '
+
+def _safe_tokenize(text: str) -> List[str]:
+    """Split text on whitespace with each punctuation mark as its own token"""
+    # A callable replacement is cheaper per match than the r' \1 ' template
+    return _PUNCT_RE.sub(_pad_match, text).split()
+
 class NLPService:
     """Service class for NLP-based Alzheimer's/dementia detection"""
     
     def __init__(self):
         self.model_control = None
-        self.weights_control = None
         self.model_alz = None
-        self.weights_alz = None
         self.vectorizer = None
         self.nlp = None
         self.models_loaded = False
+        # A thread lock: the service is built at import, outside any event loop
+        self._load_lock = threading.Lock()
         
         # POS tag dictionary for expansion
         self.pos_dictionary = {
@@ -44,22 +74,40 @@ class NLPService:
             "X": "other",
             "SPACE": "space"
         }
+        
+        # The original expansion ran str.replace over the whole tagged string
+        # once per tag, so CCONJ/SCONJ came out as "Cconjunction"/"Sconjunction"
+        # and upper-case tag names inside token text were expanded too. Every
+        # replacement is lower case, so a tag can only match inside a run of
+        # capitals: running the same replace loop on each run (and the per-tag
+        # table below) reproduces that output, overlapping tags included.
+        self._upper_run_re = re.compile("[A-Z]+")
+        self._pos_names = {
+            tag: sys.intern(self._expand_tags(tag)) for tag in self.pos_dictionary
+        }
     
     def load_models(self):
         """Load all required models and dependencies"""
         try:
             # Load spaCy model
             logger.info("Loading spaCy model...")
-            self.nlp = spacy.load('en_core_web_sm')
+            # Only POS tags and sentence boundaries are used. The attribute_ruler
+            # stays: it is what maps the tagger's fine-grained tags to pos_.
+            # Sentences come from the senter, which is far cheaper than the
+            # parser; pipelines without one keep the parser for doc.sents.
+            self.nlp = spacy.load('en_core_web_sm', exclude=['ner', 'lemmatizer'])
+            if 'senter' in self.nlp.disabled:
+                self.nlp.remove_pipe('parser')
+                self.nlp.enable_pipe('senter')
             
             # Load ML models
+            # The feature weights come folded into the float32 coefficients
+            # (model_io.prepare_model), so predictions skip a sparse multiply
             logger.info("Loading control model...")
-            with open('model_control.pkl', 'rb') as f:
-                self.model_control, self.weights_control = pickle.load(f)
+            self.model_control = load_model('model_control')
             
             logger.info("Loading Alzheimer's model...")
-            with open('model_alz.pkl', 'rb') as f:
-                self.model_alz, self.weights_alz = pickle.load(f)
+            self.model_alz = load_model('model_alz')
             
             logger.info("Loading vectorizer...")
             with open('vectorizer.pkl', 'rb') as f:
@@ -72,65 +120,77 @@ class NLPService:
             logger.info("All NLP models loaded successfully!")
             
         except Exception as e:
-            logger.error(f"Error loading models: {str(e)}")
+            logger.error("Error loading models: %s", e)
             raise e
     
+    async def ensure_loaded(self):
+        """Load the models on first use; concurrent callers wait for the same load"""
+        if self.models_loaded:
+            return
+        await asyncio.get_running_loop().run_in_executor(None, self._load_once)
+    
+    def _load_once(self):
+        """load_models() unless another thread already has"""
+        with self._load_lock:
+            if not self.models_loaded:
+                self.load_models()
+    
     def _fix_vectorizer_tokenizer(self):
         """Fix vectorizer tokenizer as in your original code"""
-        def _safe_tokenize(text):
-            pattern = re.compile(f'([{string.punctuation}""¨«»®´·º½¾¿¡§£₤''])')
-            return pattern.sub(r' \\1 ', text).split()
-        
         try:
             if hasattr(self.vectorizer, 'tokenizer') and callable(getattr(self.vectorizer, 'tokenizer', None)):
                 self.vectorizer.tokenizer = _safe_tokenize
         except Exception as e:
-            logger.warning(f"Could not fix vectorizer tokenizer: {str(e)}")
+            logger.warning("Could not fix vectorizer tokenizer: %s", e)
     
-    def _tagged_dialogue(self, dialogue: str) -> str:
-        """Extract POS tags from dialogue using spaCy"""
-        if not self.nlp:
-            raise RuntimeError("spaCy model not loaded")
-        
-        doc = self.nlp(dialogue)
-        tagged = [(token.text, token.pos_) for token in doc]
-        tagged_temp = [' '.join(j) for j in tagged]
-        tagged_final = ' '.join(tagged_temp)
-        return tagged_final
+    def _expand_run(self, match: re.Match) -> str:
+        run = match.group()
+        for tag, name in self.pos_dictionary.items():
+            run = run.replace(tag, name)
+        return run
     
-    def _pos_complete(self, dialogue: str) -> str:
-        """Replace POS tags with their full names"""
-        address = dialogue
-        for word, initial in self.pos_dictionary.items():
-            address = address.replace(word, initial)
-        return address
+    def _expand_tags(self, text: str) -> str:
+        """Replace POS tag names inside text with their full names"""
+        return self._upper_run_re.sub(self._expand_run, text)
     
-    def _pos_text_complete(self, text: str) -> str:
-        """Complete POS processing pipeline"""
-        return self._pos_complete(self._tagged_dialogue(text))
+    def _pos_text_complete(self, doc: Doc) -> str:
+        """Interleave each token of a parsed dialogue with its full POS name"""
+        pos_names = self._pos_names
+        expand = self._expand_tags
+        # Lower-case tokens cannot contain a tag name, so only the rest are scanned
+        return " ".join(
+            f"{token.text if token.is_lower else expand(token.text)} {pos_names.get(token.pos_, token.pos_)}"
+            for token in doc
+        )
     
-    def _extract_linguistic_features(self, text: str, preprocessed_text: str) -> Dict[str, Any]:
-        """Extract linguistic features from text"""
+    def _extract_linguistic_features(self, doc: Doc) -> LinguisticFeatureCounts:
+        """Extract linguistic features from a parsed text"""
         try:
-            doc = self.nlp(text)
+            # Token attributes copied into one array by spaCy, then counted by
+            # numpy instead of a Python loop over the tokens
+            attrs = doc.to_array(_FEATURE_ATTRS)
+            words = attrs[(attrs[:, 0] == 0) & (attrs[:, 1] == 0)]
+            word_count = len(words)
+            alpha_lowers = words[words[:, 2] == 1, 4]
+            alpha_count = len(alpha_lowers)
+            unique_word_count = len(np.unique(alpha_lowers))
+            
+            # In order of first appearance, like the token loop it replaces
+            pos_ids, first_seen, pos_counts = np.unique(
+                words[:, 3], return_index=True, return_counts=True
+            )
+            strings = doc.vocab.strings
+            pos_distribution = {
+                strings[int(pos_ids[k])]: int(pos_counts[k]) for k in np.argsort(first_seen)
+            }
             
-            # Basic counts
-            word_count = len([token for token in doc if not token.is_space and not token.is_punct])
-            sentence_count = len(list(doc.sents))
+            sentence_count = sum(1 for _ in doc.sents)
             
             # Calculate average words per sentence
-            avg_words_per_sentence = word_count / sentence_count if sentence_count > 0 else 0
+            avg_words_per_sentence = word_count / sentence_count if sentence_count > 0 else 0.0
             
             # Lexical diversity (Type-Token Ratio)
-            words = [token.text.lower() for token in doc if not token.is_space and not token.is_punct and token.is_alpha]
-            unique_words = set(words)
-            lexical_diversity = len(unique_words) / len(words) if len(words) > 0 else 0
-            
-            # POS tag distribution
-            pos_tags = [token.pos_ for token in doc if not token.is_space and not token.is_punct]
-            pos_distribution = {}
-            for pos in pos_tags:
-                pos_distribution[pos] = pos_distribution.get(pos, 0) + 1
+            lexical_diversity = unique_word_count / alpha_count if alpha_count > 0 else 0.0
             
             return {
                 "word_count": word_count,
@@ -141,7 +201,7 @@ class NLPService:
             }
             
         except Exception as e:
-            logger.error(f"Error extracting linguistic features: {str(e)}")
+            logger.error("Error extracting linguistic features: %s", e)
             return {
                 "word_count": 0,
                 "sentence_count": 0,
@@ -203,71 +263,126 @@ class NLPService:
         
         return risk_level, interpretation.strip()
     
-    def analyze_text(self, text: str) -> Dict[str, Any]:
+    def _validate_text(self, text: str):
+        """Reject texts too short to analyze"""
+        if not text or len(text.strip()) < 10:
+            raise ValueError("Text must be at least 10 characters long")
+    
+    def preprocess(self, text: str) -> Tuple[Doc, str, Any]:
         """
-        Perform complete NLP analysis on input text
+        Convert raw text into its POS-tagged form and TF-IDF vector
         
         Args:
             text (str): Raw text input from speech-to-text
             
         Returns:
-            Dict containing analysis results
+            Tuple of (spaCy Doc, preprocessed text, 1-row sparse feature vector);
+            the Doc is reused by build_result() instead of parsing the text again
         """
         if not self.models_loaded:
             raise RuntimeError("Models not loaded. Call load_models() first.")
         
-        if not text or len(text.strip()) < 10:
-            raise ValueError("Text must be at least 10 characters long")
+        self._validate_text(text)
         
-        start_time = time.time()
+        # 1. Preprocess text (parse once, convert to POS tags)
+        logger.debug("Preprocessing text...")
+        doc = self.nlp(text)
+        preprocessed_text = self._pos_text_complete(doc)
         
-        try:
-            # 1. Preprocess text (convert to POS tags)
-            logger.info("Preprocessing text...")
-            preprocessed_text = self._pos_text_complete(text)
-            
-            # 2. Vectorize preprocessed text
-            logger.info("Vectorizing text...")
-            text_vector = self.vectorizer.transform([preprocessed_text])
+        # 2. Vectorize preprocessed text
+        logger.debug("Vectorizing text...")
+        text_vector = self.vectorizer.transform([preprocessed_text])
+        
+        return doc, preprocessed_text, text_vector
+    
+    def predict_batch(self, text_vectors: List[Any]) -> List[Tuple[float, float]]:
+        """
+        Score several vectorized texts with one predict_proba call per model
+        
+        Args:
+            text_vectors (list): 1-row sparse vectors returned by preprocess()
             
-            # 3. Get predictions from both models
-            logger.info("Getting model predictions...")
-            prob_control = self.model_control.predict_proba(text_vector.multiply(self.weights_control))
-            prob_alz = self.model_alz.predict_proba(text_vector.multiply(self.weights_alz))
+        Returns:
+            List of (control probability, Alzheimer's probability) per vector
+        """
+        return self._predict_features(sparse.vstack(text_vectors, format="csr"))
+    
+    def _predict_features(self, features: Any) -> List[Tuple[float, float]]:
+        """Score the rows of a feature matrix with one predict_proba call per model"""
+        logger.debug("Getting model predictions for %d text(s)...", features.shape[0])
+        # Match the float32 coefficients (the idf product leaves float64), or
+        # every predict_proba would upcast coef_
+        features = features.astype(np.float32, copy=False)
+        prob_control = self.model_control.predict_proba(features)
+        prob_alz = self.model_alz.predict_proba(features)
+        
+        return [
+            (float(control), float(alz))
+            for control, alz in zip(prob_control[:, 1], prob_alz[:, 1])
+        ]
+    
+    def build_result(self, doc: Doc, preprocessed_text: str,
+                     control_probability: float, alzheimer_probability: float) -> Dict[str, Any]:
+        """Assemble the analysis result from the model probabilities"""
+        # Determine final prediction (from your original logic)
+        prediction = 1 if control_probability > alzheimer_probability else 0
+        confidence = control_probability
+        
+        # Extract linguistic features
+        logger.debug("Extracting linguistic features...")
+        linguistic_features = self._extract_linguistic_features(doc)
+        
+        # Generate clinical interpretation
+        risk_level, clinical_interpretation = self._interpret_results(
+            prediction, confidence, control_probability, alzheimer_probability
+        )
+        
+        return {
+            "prediction": prediction,
+            "confidence": confidence,
+            "control_probability": control_probability,
+            "alzheimer_probability": alzheimer_probability,
+            "risk_level": risk_level,
+            "clinical_interpretation": clinical_interpretation,
+            "linguistic_features": linguistic_features,
+            "preprocessed_text": preprocessed_text
+        }
+    
+    def analyze_text(self, text: str) -> Dict[str, Any]:
+        """
+        Perform complete NLP analysis on input text
+        
+        Args:
+            text (str): Raw text input from speech-to-text
             
-            # 4. Determine final prediction (from your original logic)
-            prediction = 1 if prob_control[0][1] > prob_alz[0][1] else 0
-            confidence = float(prob_control[0][1])
-            control_probability = float(prob_control[0][1])
-            alzheimer_probability = float(prob_alz[0][1])
+        Returns:
+            Dict containing analysis results
+        """
+        start = time.perf_counter_ns()
+        
+        try:
+            doc, preprocessed_text, text_vector = self.preprocess(text)
+            preprocessed = time.perf_counter_ns()
+            control_probability, alzheimer_probability = self.predict_batch([text_vector])[0]
+            predicted = time.perf_counter_ns()
+            result = self.build_result(doc, preprocessed_text, control_probability, alzheimer_probability)
+            finished = time.perf_counter_ns()
             
-            # 5. Extract linguistic features
-            logger.info("Extracting linguistic features...")
-            linguistic_features = self._extract_linguistic_features(text, preprocessed_text)
+            processing_time = (finished - start) / 1e9
             
-            # 6. Generate clinical interpretation
-            risk_level, clinical_interpretation = self._interpret_results(
-                prediction, confidence, control_probability, alzheimer_probability
+            logger.info("Analysis completed in %.2f seconds", processing_time)
+            logger.debug(
+                "preprocess=%dms predict_proba=%dms features=%dms",
+                (preprocessed - start) // 1_000_000,
+                (predicted - preprocessed) // 1_000_000,
+                (finished - predicted) // 1_000_000
             )
             
-            processing_time = time.time() - start_time
-            
-            logger.info(f"Analysis completed in {processing_time:.2f} seconds")
-            
-            return {
-                "prediction": prediction,
-                "confidence": confidence,
-                "control_probability": control_probability,
-                "alzheimer_probability": alzheimer_probability,
-                "risk_level": risk_level,
-                "clinical_interpretation": clinical_interpretation,
-                "linguistic_features": linguistic_features,
-                "preprocessed_text": preprocessed_text,
-                "processing_time_seconds": processing_time
-            }
+            result["processing_time_seconds"] = processing_time
+            return result
             
         except Exception as e:
-            logger.error(f"Error in text analysis: {str(e)}")
+            logger.error("Error in text analysis: %s", e)
             raise e
     
     def batch_analyze(self, texts: list) -> list:
@@ -275,18 +390,53 @@ class NLPService:
         if not self.models_loaded:
             raise RuntimeError("Models not loaded. Call load_models() first.")
         
-        results = []
+        start = time.perf_counter_ns()
+        results: List[Optional[Dict[str, Any]]] = [None] * len(texts)
+        
+        valid = []
         for i, text in enumerate(texts):
             try:
-                logger.info(f"Processing text {i+1}/{len(texts)}")
-                result = self.analyze_text(text)
-                results.append(result)
-            except Exception as e:
-                logger.error(f"Error processing text {i+1}: {str(e)}")
-                results.append({
-                    "error": str(e),
-                    "text_index": i
-                })
+                self._validate_text(text)
+                valid.append(i)
+            except ValueError as e:
+                results[i] = {"error": str(e), "text_index": i}
+        
+        if not valid:
+            return results
+        
+        try:
+            # One spaCy stream, one vectorizer call and one predict_proba per
+            # model for the whole batch
+            docs = list(self.nlp.pipe((texts[i] for i in valid), batch_size=64))
+            preprocessed_texts = [self._pos_text_complete(doc) for doc in docs]
+            features = self.vectorizer.transform(preprocessed_texts)
+            preprocessed = time.perf_counter_ns()
+            probabilities = self._predict_features(features)
+            predicted = time.perf_counter_ns()
+            
+            for i, doc, preprocessed_text, (control_probability, alzheimer_probability) in zip(
+                valid, docs, preprocessed_texts, probabilities
+            ):
+                results[i] = self.build_result(doc, preprocessed_text, control_probability, alzheimer_probability)
+            
+            logger.debug(
+                "batch of %d: preprocess=%dms predict_proba=%dms features=%dms",
+                len(valid),
+                (preprocessed - start) // 1_000_000,
+                (predicted - preprocessed) // 1_000_000,
+                (time.perf_counter_ns() - predicted) // 1_000_000
+            )
+        except Exception as e:
+            logger.error("Error processing batch of %d texts: %s", len(valid), e)
+            for i in valid:
+                results[i] = {"error": str(e), "text_index": i}
+        
+        # Time per text, amortized over the batch
+        processing_time = (time.perf_counter_ns() - start) / 1e9
+        logger.info("Batch of %d texts analyzed in %.2f seconds", len(texts), processing_time)
+        for i in valid:
+            if "error" not in results[i]:
+                results[i]["processing_time_seconds"] = processing_time / len(valid)
         
         return results
     
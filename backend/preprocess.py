@@ -3,15 +3,17 @@ import pickle
 import sklearn
 from sklearn.feature_extraction.text import TfidfVectorizer
 import dill
+import numpy as np
+from scipy import sparse
 import re
 import string 
 
-nlp = spacy.load('en_core_web_sm')
+# Only the POS tags are used (the attribute_ruler maps tags to pos_), so
+# the parser is not loaded either
+nlp = spacy.load('en_core_web_sm', exclude=['parser', 'ner', 'lemmatizer'])
 def tagged_dialogue(dialogue):
-    tagged = [(token.text, token.pos_) for token in nlp(dialogue)]  # To get tag and dep labels, replace pos_ by tag_ and dep_. See spacy documentation for meanings.
-    tagged_temp = [' '.join(j) for j in tagged]
-    tagged_final = ' '.join(tagged_temp)
-    return(tagged_final)
+    # To get tag and dep labels, replace pos_ by tag_ and dep_. See spacy documentation for meanings.
+    return ' '.join(f'{token.text} {token.pos_}' for token in nlp(dialogue))
 
 dictionary = { "ADJ":"adjective",
 "ADP":"adposition",
@@ -33,11 +35,20 @@ dictionary = { "ADJ":"adjective",
 "X":"other",
 "SPACE":"space"}
 
-def pos_complete(dialogue):
-    address = dialogue
+# One scan over the text instead of a str.replace pass per tag. Replacements
+# are lower case, so tags only match inside runs of capitals; the old replace
+# loop runs on just those runs, which keeps its exact output (CCONJ becomes
+# "Cconjunction", PRONOUN becomes "PROnoun") that the vocabulary was fit on.
+_UPPER_RUN_RE = re.compile('[A-Z]+')
+
+def _expand_run(match):
+    run = match.group()
     for word, initial in dictionary.items():
-        address = address.replace(word, initial)
-    return(address)
+        run = run.replace(word, initial)
+    return run
+
+def pos_complete(dialogue):
+    return _UPPER_RUN_RE.sub(_expand_run, dialogue)
 
 def pos_text_complete(text):
   return pos_complete(tagged_dialogue(text))
@@ -46,13 +57,17 @@ def pos_text_complete(text):
 with open(r'backend/vectorizer.pkl', 'rb') as f:
     vec = dill.load(f)
 
+# Compiled once at import; the tokenizer runs on every transform() call
+_PUNCT_RE = re.compile(f'([{string.punctuation}“”¨«»®´·º½¾¿¡§£₤‘’])')
+
+# A callable replacement is cheaper per match than the r' \1 ' template
+def _pad_match(match):
+    return f' {match[0]} '
+
 # Ensure tokenizer dependencies are available even if the dill-loaded function
 # didn't capture globals correctly. Override tokenizer defensively.
 def _safe_tokenize(text):
-    import re as _re
-    import string as _string
-    pattern = _re.compile(f'([{_string.punctuation}“”¨«»®´·º½¾¿¡§£₤‘’])')
-    return pattern.sub(r' \\1 ', text).split()
+    return _PUNCT_RE.sub(_pad_match, text).split()
 
 try:
     # Only set if attribute exists; scikit-learn will read it at transform time
@@ -61,10 +76,49 @@ try:
 except Exception:
     pass
 
+# Everything vec.transform() needs for one document, resolved once. Built after
+# the tokenizer override above, since the analyzer captures the tokenizer.
+_analyze = vec.build_analyzer()
+_vocabulary_get = vec.vocabulary_.get
+# Vectorizers pickled by scikit-learn < 1.3 keep the idf as a diagonal matrix
+_idf = np.asarray(
+    vec._tfidf._idf_diag.diagonal() if hasattr(vec._tfidf, '_idf_diag') else vec.idf_,
+    dtype=np.float32
+)
+
+
+def _tfidf_row(doc):
+    """vec.transform([doc]) for one document, built as a single CSR row
+
+    Skips the intermediate count matrix, the idf diagonal product and the
+    normalize() copy: the vocabulary hits are counted with numpy and the tf-idf
+    values computed in place before one csr_matrix((data, indices, indptr)).
+    """
+    hits = [j for j in map(_vocabulary_get, _analyze(doc)) if j is not None]
+    indices, counts = np.unique(np.array(hits, dtype=np.int32), return_counts=True)
+
+    data = counts.astype(np.float32)
+    if vec.sublinear_tf:
+        np.log(data, out=data)
+        data += 1
+    data *= _idf[indices]
+    norm = np.sqrt(np.dot(data, data))
+    if norm > 0:
+        data /= norm
+
+    indptr = np.array([0, len(indices)], dtype=np.int32)
+    return sparse.csr_matrix((data, indices, indptr), shape=(1, len(_idf)), copy=False)
+
+# _tfidf_row covers the fitted settings: l2 norm, idf weighting, raw counts
+_FAST_TFIDF = vec.norm == 'l2' and vec.use_idf and not vec.binary
+
 
 def preprocess_text(text):
     pos_text = pos_text_complete(text)
-    new_text_vec = vec.transform([pos_text])
+    if not _FAST_TFIDF:
+        # float32 like _tfidf_row, to match the model coefficients in app.py
+        return vec.transform([pos_text]).astype(np.float32, copy=False)
+    new_text_vec = _tfidf_row(pos_text)
     return new_text_vec
 
 raw_text = "the boy is on a stool that is falling while he's trying to get some cookies out_of the cookie jar in the top shelf (.) of the cupboard .  the little girl is reaching for a cookie .  it looks like she's sort of laughing at the boy or putting her finger up to her mouth to be quiet so her mother doesn't hear who is in the kitchen drying dishes but the water in the sink is overflowing onto the floor and she's stepping in the water .  the window is open .  looks like &+s it's summer outside . [+ gram]  yeah there's trees with leaves .  is that all (.) you want me to do ? [+ exc]  she's [//] (.) doesn't look it's like she hears them .  she doesn't seem to be aware of them .  some of the dishes are already washed and dried .  is that all you want me to say ? [+ exc]"
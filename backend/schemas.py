@@ -1,5 +1,5 @@
-from pydantic import BaseModel, EmailStr, Field, validator
-from typing import Optional, List, Dict, Any
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, create_model
+from typing import Optional, List, Dict, Any, Mapping
 from datetime import datetime
 from enum import Enum
 
@@ -27,6 +27,21 @@ class RiskLevel(str, Enum):
     medium = "Medium"
     high = "High"
 
+# ============================================================================
+# BASE SCHEMAS
+# ============================================================================
+
+class ORMResponse(BaseModel):
+    """Base for responses built from database rows"""
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+    
+    @classmethod
+    def row_dict(cls, row: Any) -> Dict[str, Any]:
+        """Pick this schema's fields from a trusted row (mapping or ORM object), unvalidated"""
+        if isinstance(row, Mapping):
+            return {name: row[name] for name in cls.model_fields}
+        return {name: getattr(row, name) for name in cls.model_fields}
+
 # ============================================================================
 # USER SCHEMAS
 # ============================================================================
@@ -38,22 +53,14 @@ class UserBase(BaseModel):
     role: UserRole = UserRole.doctor
 
 class UserCreate(UserBase):
+    # The length limits are enforced by pydantic-core, no validator needed
     password: str = Field(..., min_length=8, max_length=128)
-    
-    @validator('password')
-    def validate_password(cls, v):
-        if len(v) < 8:
-            raise ValueError('Password must be at least 8 characters long')
-        return v
 
-class UserResponse(UserBase):
+class UserResponse(UserBase, ORMResponse):
     id: int
     is_active: bool
     created_at: datetime
     updated_at: datetime
-    
-    class Config:
-        from_attributes = True
 
 class Token(BaseModel):
     access_token: str
@@ -82,16 +89,13 @@ class PatientBase(BaseModel):
 class PatientCreate(PatientBase):
     pass
 
-class PatientResponse(PatientBase):
+class PatientResponse(PatientBase, ORMResponse):
     id: int
     patient_id: str
     doctor_id: int
     is_active: bool
     created_at: datetime
     updated_at: datetime
-    
-    class Config:
-        from_attributes = True
 
 # ============================================================================
 # ASSESSMENT SCHEMAS
@@ -133,38 +137,22 @@ class AssessmentBase(BaseModel):
 class AssessmentCreate(AssessmentBase):
     patient_id: str
 
-class AssessmentUpdate(BaseModel):
-    status: Optional[AssessmentStatus] = None
-    completed_at: Optional[datetime] = None
-    duration_minutes: Optional[float] = None
-    
-    # All other fields from AssessmentBase
-    immediate_recall_score: Optional[int] = None
-    immediate_recall_words: Optional[List[str]] = None
-    delayed_recall_score: Optional[int] = None
-    delayed_recall_words: Optional[List[str]] = None
-    distraction_task_score: Optional[int] = None
-    distraction_task_data: Optional[Dict[str, Any]] = None
-    
-    verbal_fluency_score: Optional[int] = None
-    verbal_fluency_words: Optional[List[str]] = None
-    verbal_fluency_category: Optional[str] = None
-    
-    trail_a_time: Optional[float] = None
-    trail_b_time: Optional[float] = None
-    trail_a_errors: Optional[int] = None
-    trail_b_errors: Optional[int] = None
-    
-    total_score: Optional[float] = None
-    percentile_score: Optional[float] = None
-    cognitive_domain_scores: Optional[Dict[str, float]] = None
-    interpretation: Optional[str] = None
-    recommendations: Optional[str] = None
-    
-    notes: Optional[str] = None
-    raw_data: Optional[Dict[str, Any]] = None
-
-class AssessmentResponse(AssessmentBase):
+# Every AssessmentBase field except the type, made optional for partial
+# updates, plus the completion fields. Derived rather than redeclared so the
+# two field lists cannot drift apart.
+AssessmentUpdate = create_model(
+    "AssessmentUpdate",
+    status=(Optional[AssessmentStatus], None),
+    completed_at=(Optional[datetime], None),
+    duration_minutes=(Optional[float], None),
+    **{
+        name: (field.annotation, field)
+        for name, field in AssessmentBase.model_fields.items()
+        if name not in ("assessment_type", "status")
+    }
+)
+
+class AssessmentResponse(AssessmentBase, ORMResponse):
     id: int
     assessment_id: str
     patient_id: int
@@ -173,9 +161,6 @@ class AssessmentResponse(AssessmentBase):
     duration_minutes: Optional[float] = None
     created_at: datetime
     updated_at: datetime
-    
-    class Config:
-        from_attributes = True
 
 # ============================================================================
 # NLP ANALYSIS SCHEMAS
@@ -217,7 +202,7 @@ class NLPAnalysisCreate(NLPAnalysisBase):
     patient_id: Optional[str] = None
     assessment_id: Optional[int] = None
 
-class NLPAnalysisResponse(NLPAnalysisBase):
+class NLPAnalysisResponse(NLPAnalysisBase, ORMResponse):
     id: int
     analysis_id: str
     patient_id: Optional[int] = None
@@ -227,9 +212,6 @@ class NLPAnalysisResponse(NLPAnalysisBase):
     sentence_count: Optional[int] = None
     processing_time_ms: Optional[int] = None
     created_at: datetime
-    
-    class Config:
-        from_attributes = True
 
 # ============================================================================
 # PROGRESS TRACKING SCHEMAS
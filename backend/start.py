@@ -3,6 +3,7 @@
 Startup script for Dementia Detection API
 """
 
+import shutil
 import subprocess
 import sys
 import os
@@ -14,7 +15,12 @@ def check_python_version():
         print("Error: Python 3.8 or higher is required")
         sys.exit(1)
 
-def check_models_exist():
+def present_files():
+    """Names of the files in the current directory, from one directory read"""
+    with os.scandir(".") as entries:
+        return {entry.name for entry in entries if entry.is_file()}
+
+def check_models_exist(present=None):
     """Check if required ML model files exist"""
     required_files = [
         "model_control.pkl",
@@ -22,10 +28,9 @@ def check_models_exist():
         "vectorizer.pkl"
     ]
     
-    missing_files = []
-    for file in required_files:
-        if not Path(file).exists():
-            missing_files.append(file)
+    if present is None:
+        present = present_files()
+    missing_files = [file for file in required_files if file not in present]
     
     if missing_files:
         print("Error: Missing required model files:")
@@ -36,12 +41,28 @@ def check_models_exist():
     
     return True
 
+def convert_models():
+    """Re-dump the classifier pickles as memory-mappable joblib files"""
+    print("Converting model files for memory-mapped loading...")
+    try:
+        # Imported here since the dependencies may have only just been installed
+        import model_io
+        model_io.convert_models()
+        return True
+    except Exception as e:
+        print(f"Warning: Model conversion failed ({e}); the .pkl files will be loaded instead")
+        return False
+
 def install_dependencies():
     """Install required Python packages"""
     print("Installing dependencies...")
+    # uv installs the same requirements much faster than pip when it is available
+    if shutil.which("uv"):
+        cmd = ["uv", "pip", "install", "--python", sys.executable, "-r", "requirements.txt"]
+    else:
+        cmd = [sys.executable, "-m", "pip", "install", "-r", "requirements.txt"]
     try:
-        subprocess.run([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"], 
-                      check=True)
+        subprocess.run(cmd, check=True)
         print("Dependencies installed successfully!")
         return True
     except subprocess.CalledProcessError:
@@ -50,6 +71,15 @@ def install_dependencies():
 
 def download_spacy_model():
     """Download required spaCy model"""
+    # requirements.txt normally installs it already; skip the download then
+    try:
+        from spacy.util import is_package
+        if is_package("en_core_web_sm"):
+            print("spaCy model already installed.")
+            return True
+    except ImportError:
+        pass
+    
     print("Downloading spaCy English model...")
     try:
         subprocess.run([sys.executable, "-m", "spacy", "download", "en_core_web_sm"], 
@@ -65,7 +95,7 @@ def setup_environment():
     if not Path(".env").exists():
         if Path(".env.template").exists():
             print("Creating .env file from template...")
-            subprocess.run(["cp", ".env.template", ".env"])
+            shutil.copyfile(".env.template", ".env")
             print("Environment file created! Please review and update .env as needed.")
         else:
             print("Warning: No .env.template found. Please create a .env file manually.")
@@ -74,11 +104,15 @@ def initialize_database():
     """Initialize database with demo data"""
     print("Initializing database...")
     try:
-        subprocess.run([sys.executable, "init_db.py", "demo"], check=True)
+        # Same as 'python init_db.py demo', without starting another interpreter.
+        # Imported here since the dependencies may have only just been installed.
+        from init_db import init_database, create_demo_data
+        init_database()
+        create_demo_data()
         print("Database initialized with demo data!")
         return True
-    except subprocess.CalledProcessError:
-        print("Error: Failed to initialize database")
+    except Exception as e:
+        print(f"Error: Failed to initialize database: {e}")
         return False
 
 def start_server(dev_mode=True):
@@ -86,19 +120,16 @@ def start_server(dev_mode=True):
     print(f"Starting server in {'development' if dev_mode else 'production'} mode...")
     
     if dev_mode:
-        cmd = [
-            "uvicorn", "main:app", 
-            "--reload", 
-            "--host", "0.0.0.0", 
-            "--port", "8000"
-        ]
-    else:
-        cmd = [
-            "uvicorn", "main:app",
-            "--host", "0.0.0.0",
-            "--port", "8000"
-        ]
+        # Served from this interpreter; the reloader still needs the import string
+        import uvicorn
+        try:
+            uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
+        except KeyboardInterrupt:
+            print("\nServer stopped.")
+        return
     
+    # Models are loaded once and shared by the forked workers
+    cmd = ["gunicorn", "-c", "gunicorn.conf.py", "main:app"]
     try:
         subprocess.run(cmd)
     except KeyboardInterrupt:
@@ -146,6 +177,9 @@ def main():
                 print("Please add the required .pkl files before starting the server.")
                 sys.exit(1)
             
+            # Workers then share the model arrays through the page cache
+            convert_models()
+            
             # Initialize database
             if not initialize_database():
                 sys.exit(1)
@@ -165,11 +199,12 @@ def main():
         elif command == "check":
             print("Checking system requirements...")
             
+            present = present_files()
             checks = [
                 ("Python version", lambda: sys.version_info >= (3, 8)),
-                ("ML model files", check_models_exist),
-                ("Environment file", lambda: Path(".env").exists()),
-                ("Database file", lambda: Path("dementia_detection.db").exists())
+                ("ML model files", lambda: check_models_exist(present)),
+                ("Environment file", lambda: ".env" in present),
+                ("Database file", lambda: "dementia_detection.db" in present)
             ]
             
             all_good = True